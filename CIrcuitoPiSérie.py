@@ -1,5 +1,6 @@
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Parâmetros da linha de transmissão
 R = 0.1  # Resistência por unidade de comprimento (ohm/km)
@@ -8,61 +9,134 @@ C = 10e-9  # Capacitância por unidade de comprimento (F/km)
 G = 1e-6  # Condutância por unidade de comprimento (S/km)
 length = 100  # Comprimento da linha (km)
 f = 60  # Frequência (Hz)
-omega = 2 * np.pi * f  # Frequência angular (rad/s)
 
-# Impedância e admitância por unidade de comprimento
-Z = R + 1j * omega * L  # Impedância série (ohm/km)
-Y = G + 1j * omega * C  # Admitância shunt (S/km)
+# Condições da linha
+Vs = 100e3  # Tensão na fonte (V, rms)
+Z_load = 500  # Impedância da carga (ohm)
 
-# Parâmetros do modelo π
-Z_total = Z * length  # Impedância série total
-Y_total = Y * length  # Admitância shunt total
-Y_shunt = Y_total / 2  # Admitância shunt em cada extremidade do modelo π
+# Perfil de tensão calculado em paralelo: cada ponto x[i] é independente dos demais
+# Só compensa para perfis grandes; abaixo deste número de pontos o NumPy é usado diretamente
+PARALLEL_MIN_POINTS = 100_000
 
-# Impedância característica e constante de propagação
-Z0 = np.sqrt(Z / Y)  # Impedância característica
-gamma = np.sqrt(Z * Y)  # Constante de propagação
+_compute_Vx = None  # Kernel compilado, criado apenas na primeira vez que for necessário
 
-# Matriz ABCD do modelo π
-A = 1 + Z_total * Y_shunt
-B = Z_total
-C = Y_total + Z_total * Y_shunt * Y_shunt
-D = A
+def compute_Vx(x, gamma, Z0, V_load, I_load, out):
+    """Preenche out[i] = cosh(γ·x[i])·V_load + Z0·sinh(γ·x[i])·I_load com um kernel Numba paralelo."""
+    global _compute_Vx
+    if _compute_Vx is None:
+        # O numba só é importado (e o kernel compilado) quando o cálculo paralelo é usado
+        from numba import njit, prange
 
-# Condições da linha
-Vs = 100e3  # Tensão na fonte (V, rms)
-Z_load = 500  # Impedância da carga (ohm)
+        @njit(parallel=True)
+        def kernel(x, gamma, Z0, V_load, I_load, out):
+            for i in prange(x.size):
+                gx = gamma * x[i]
+                out[i] = np.cosh(gx) * V_load + Z0 * np.sinh(gx) * I_load
+
+        _compute_Vx = kernel
+    _compute_Vx(x, gamma, Z0, V_load, I_load, out)
+
+# Cálculo da linha
+# Parametrizado em uma função para permitir varreduras de parâmetros e reuso em outros estudos
+def run(R, L, C, G, length, f, Vs, Z_load, n_points):
+    """Calcula o perfil de tensão ao longo da linha e as grandezas na carga.
+
+    Retorna x, V_x, Z0, gamma, V_load e I_load.
+    """
+    omega = 2 * np.pi * f  # Frequência angular (rad/s)
+
+    # Impedância e admitância por unidade de comprimento
+    Z = R + 1j * omega * L  # Impedância série (ohm/km)
+    Y = G + 1j * omega * C  # Admitância shunt (S/km)
+
+    # Impedância característica e constante de propagação
+    Z0 = np.sqrt(Z / Y)  # Impedância característica
+    gamma = np.sqrt(Z * Y)  # Constante de propagação
+
+    # Parâmetros do modelo π equivalente (linha longa)
+    # Os fatores de correção sinh(γl)/(γl) e tanh(γl/2)/(γl/2) tornam o modelo π exato:
+    # A = D = cosh(γl), B = Z0·sinh(γl), C = sinh(γl)/Z0
+    # Para uma linha de comprimento zero os dois fatores valem 1 (limite de sinh(z)/z e tanh(z)/z)
+    gl = gamma * length
+    gl_half = gl * 0.5
+    if gl == 0:
+        Z_factor = 1.0
+        Y_factor = 1.0
+    else:
+        Z_factor = np.sinh(gl) / gl
+        Y_factor = np.tanh(gl_half) / gl_half
+    Z_total = Z * length * Z_factor  # Impedância série total corrigida
+    Y_total = Y * length * Y_factor  # Admitância shunt total corrigida
+    Y_shunt = Y_total * 0.5  # Admitância shunt em cada extremidade do modelo π
+
+    # Matriz ABCD do modelo π
+    A = 1 + Z_total * Y_shunt
+    B = Z_total
+    Y_shunt_sq = Y_shunt * Y_shunt
+    C = Y_total + Z_total * Y_shunt_sq
+    D = A
+
+    # Cálculo de tensão e corrente na carga usando a matriz ABCD
+    I_load = Vs / (A * Z_load + B)
+    V_load = Z_load * I_load
+
+    # Perfil de tensão ao longo da linha (solução exata da linha distribuída)
+    x = np.linspace(0, length, n_points, dtype=np.float32)  # Distância a partir da carga (km)
+
+    # O perfil é calculado em precisão simples (complex64), suficiente para a visualização;
+    # os parâmetros escalares da linha continuam em precisão dupla
+    gamma_32 = np.complex64(gamma)
+    Z0_32 = np.complex64(Z0)
+    V_load_32 = np.complex64(V_load)
+    I_load_32 = np.complex64(I_load)
+
+    # Matriz ABCD de um trecho de comprimento x (A = cosh(γx), B = Z0·sinh(γx)) aplicada à carga
+    if n_points >= PARALLEL_MIN_POINTS:
+        V_x = np.empty(n_points, dtype=np.complex64)
+        compute_Vx(x, gamma_32, Z0_32, V_load_32, I_load_32, V_x)
+    else:
+        gx = gamma_32 * x
+        V_x = np.cosh(gx) * V_load_32 + Z0_32 * np.sinh(gx) * I_load_32
+
+    return x, V_x, Z0, gamma, V_load, I_load
+
+# Visualização dos resultados
+# O matplotlib só é importado se o gráfico for pedido, evitando o custo de importação em varreduras
+def plot_results(x, V_x):
+    """Plota a magnitude do perfil de tensão ao longo da linha."""
+    import matplotlib.pyplot as plt
+
+    # Com --n-points muito grande, desenha no máximo ~5000 pontos (o perfil é suave)
+    # O último ponto (x = length, extremidade emissora) é sempre incluído
+    stride = max(1, x.size // 5000)
+    idx = np.unique(np.append(np.arange(0, x.size, stride), x.size - 1))
+
+    # Plot do perfil de tensão (magnitude)
+    plt.figure(figsize=(10, 6))
+    plt.plot(x[idx], np.abs(V_x[idx]) / 1e3, label='Magnitude da Tensão (kV)')
+    plt.xlabel('Distância (km)')
+    plt.ylabel('Tensão (kV)')
+    plt.title('Perfil de Tensão ao Longo da Linha (Modelo π)')
+    plt.grid(True)
+    plt.legend()
+    plt.show()
+
+if __name__ == '__main__':
+    # Argumentos de linha de comando
+    parser = argparse.ArgumentParser(description='Perfil de tensão ao longo de uma linha de transmissão.')
+    parser.add_argument('--n-points', type=int, default=100,
+                        help='Número de pontos do perfil de tensão (o cálculo paralelo é usado a partir de 1e5 pontos)')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Não exibe o gráfico (útil em varreduras de parâmetros)')
+    args = parser.parse_args()
+
+    x, V_x, Z0, gamma, V_load, I_load = run(R, L, C, G, length, f, Vs, Z_load, args.n_points)
+
+    if not args.no_plot:
+        plot_results(x, V_x)
 
-# Cálculo de tensão e corrente na carga usando a matriz ABCD
-I_load = Vs / (A * Z_load + B)
-V_load = Z_load * I_load
-
-# Perfil de tensão ao longo da linha (aproximação para visualização)
-n_points = 100
-x = np.linspace(0, length, n_points)
-V_x = np.zeros(n_points, dtype=complex)
-for i in range(n_points):
-    l = x[i]
-    # Matriz ABCD para uma seção parcial da linha
-    Z_partial = Z * l
-    Y_partial = Y * l
-    Y_shunt_partial = Y_partial / 2
-    A_partial = 1 + Z_partial * Y_shunt_partial
-    B_partial = Z_partial
-    V_x[i] = (A_partial * V_load + B_partial * I_load)
-
-# Plot do perfil de tensão (magnitude)
-plt.figure(figsize=(10, 6))
-plt.plot(x, np.abs(V_x) / 1e3, label='Magnitude da Tensão (kV)')
-plt.xlabel('Distância (km)')
-plt.ylabel('Tensão (kV)')
-plt.title('Perfil de Tensão ao Longo da Linha (Modelo π)')
-plt.grid(True)
-plt.legend()
-plt.show()
-
-# Exibir parâmetros calculados
-print(f"Impedância característica: {np.abs(Z0):.2f} ∠ {np.angle(Z0, deg=True):.2f}° ohm")
-print(f"Constante de propagação: {gamma:.2e}")
-print(f"Tensão na carga: {np.abs(V_load)/1e3:.2f} kV")
-print(f"Corrente na carga: {np.abs(I_load):.2f} A")
\ No newline at end of file
+    # Exibir parâmetros calculados
+    print(f"Impedância característica: {np.abs(Z0):.2f} ∠ {np.angle(Z0, deg=True):.2f}° ohm")
+    print(f"Constante de propagação: {gamma:.2e}")
+    print(f"Tensão na carga: {np.abs(V_load)/1e3:.2f} kV")
+    print(f"Corrente na carga: {np.abs(I_load):.2f} A")
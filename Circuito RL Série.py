@@ -8,119 +8,182 @@ test 3
 
 # Importação de Bibliotecas
 # NumPy - cálculos numéricos e manipulação de vetores.
-# Matplotlib - gráficos
+# argparse - argumentos de linha de comando (ex.: --no-plot)
+# Matplotlib - gráficos (importado apenas na hora de plotar, veja plot_results)
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Parâmetros do Sistema e do Evento
 # Define as características físicas do circuito elétrico
 L = 0.1 # Indutância da linha (Henry). Representa a oposição à mudança de corrente
 V_fonte = 220.0 # Tensão da fonte de alimentação (Volts)
 
-# Esta função simula um evento dinâmico no circuito.
-# Neste caso, um curto-circuito parcial que ocorre em t=0.05s.
-def pegar_resistência(time):
-    """Retorna a resistência do circuito baseada no tempo para simular um evento."""
-    if time < 0.05:
-        # Antes de 50ms, o circuito opera com sua resistência normal.
-        return 10.0
-    else:
-        # Após 50ms, a resistência cai drasticamente, simulando uma falha (curto-circuito).
-        return 1.0
+# Evento dinâmico no circuito: um curto-circuito parcial que ocorre em t=0.05s.
+R_event_time = 0.05 # Instante do evento (segundos)
+R_before = 10.0 # Antes de 50ms, o circuito opera com sua resistência normal (ohms).
+R_after = 1.0 # Após 50ms, a resistência cai drasticamente, simulando uma falha (curto-circuito).
+
+# A resistência é montada como uma tabela (R_arr) com um valor por instante de tempo,
+# logo após a criação do vetor de tempo. Ela equivale à função abaixo, que não é mais
+# chamada a cada passo e fica apenas como documentação do evento:
+#
+# def pegar_resistência(time):
+#     """Retorna a resistência do circuito baseada no tempo para simular um evento."""
+#     if time < 0.05:
+#         # Antes de 50ms, o circuito opera com sua resistência normal.
+#         return 10.0
+#     else:
+#         # Após 50ms, a resistência cai drasticamente, simulando uma falha (curto-circuito).
+#         return 1.0
 
 # Parâmetros da Simulação
 # Define a "qualidade" e a duração da simulação.
 t_max = 0.1   # Tempo total que a simulação irá durar (segundos).
 dt = 1e-5     # Passo de tempo (segundos). Intervalo entre cada cálculo.
               # Um 'dt' pequeno aumenta a precisão, mas exige mais cálculos!!!
-n_steps = int(t_max / dt) # Calcula o número total de passos ou iterações na simulação.
-t = np.linspace(0, t_max, n_steps) # Cria um vetor de tempo, com todos os instantes de tempo da simulação.
-                                   # Sequência de números que são igualmente espaçados entre si relóio da simulação
-
-# Inicialização das Variáveis 
-# Prepara os vetores que armazenarão os resultados em cada passo de tempo
-# Começam com zeros e serão preenchidos durante o loop
-
-# A única variável de estado do o sistema é a corrente no indutor (i_L)
-# O estado descreve a "memória" ou a condição interna do sistema
-i_L = np.zeros(n_steps) # np.zeros cria uma matriz cheia de zeros a serem "completado"
-
-# As saídas são as grandezas a serem medidas
-v_R = np.zeros(n_steps) # Tensão no resistor
-v_L = np.zeros(n_steps) # Tensão no indutor
-
-# Condição inicial do sistema
-# No tempo t=0, o circuito está desligado, então a corrente é zero
-x = 0.0  # O estado 'x' é a corrente i_L. x(0) = 0
-
-# A entrada do sistema (sinal de controle)
-# Neste caso, é a tensão constante da fonte
-u = V_fonte
-
-# Loop Principal da Simulação
-for n in range(n_steps - 1): # O loop vai do passo 0 até o penúltimo passo
-    
-    # Pega o valor da resistência para o instante de tempo atual (t[n])
-    R_n = pegar_resistência(t[n])
-
-    # Monta as "matrizes" (que aqui são números únicos) do modelo de estado
-    # Essas matrizes vêm da equação: di/dt = (-R/L)*i + (1/L)* V_fonte
-    A = -R_n / L   # Matriz A: Como o estado atual (corrente) influencia a sua própria mudança.
-    B = 1 / L      # Matriz B: Como a entrada (tensão da fonte) influencia a mudança do estado.
-
-    # Aplica o método da Integração Trapezoidal para encontrar o próximo valor da corrente
-    # Este método é numericamente estável e mais preciso que métodos mais simples (como Euler)
-    # A fórmula é: (1 - dt/2 * A) * x_próximo = (1 + dt/2 * A) * x_agora + dt * B * u
-    
-    # Calcula o termo que multiplica o estado futuro (x_próximo)
-    lado_esquerdo = 1 - (dt / 2) * A
-    
-    # Calcula todo o lado direito da equação, que depende apenas de valores conhecidos (do passo atual)
-    lado_direito = (1 + (dt / 2) * A) * x + dt * B * u
-
-    # Resolve a equação para encontrar o próximo estado (x_próximo)
-    # Como é uma equação simples, basta uma divisão
-    x_próximo = lado_direito / lado_esquerdo
-    
-    # ---- Atualização para o próximo passo ----
-    
-    # Guarda o valor da corrente calculado no vetor de resultados
-    i_L[n + 1] = x_próximo
-    
-    # Atualiza a variável 'x' para ser usada na próxima iteração do loop
-    x = x_próximo
-    
-    # Calcula as tensões (saídas) com base no novo estado (nova corrente)
-    R_proxíma = pegar_resistência(t[n+1])
-    v_R[n + 1] = R_proxíma * i_L[n + 1] # Lei de Ohm: v_R = R * i
-    v_L[n + 1] = V_fonte - v_R[n + 1] # Lei de Kirchhoff: v_L = V_fonte - v_R
+
+# Simulação
+# Toda a simulação fica em uma função parametrizada, para que possa ser chamada
+# várias vezes (varreduras de parâmetros, Monte Carlo, otimização) sem repetir o script.
+def run(L, V_fonte, t_max, dt, R_event_time, R_before, R_after):
+    """Simula o circuito RL com a resistência mudando de R_before para R_after em t = R_event_time.
+
+    Retorna o vetor de tempo, a corrente no indutor e as tensões no resistor e no indutor.
+    """
+    # Cria o vetor de tempo, com todos os instantes de tempo da simulação.
+    # Os instantes são espaçados exatamente de 'dt', o mesmo passo usado na integração
+    n_steps = int(t_max / dt) # Calcula o número total de passos ou iterações na simulação.
+    t = np.arange(n_steps) * dt
+    if n_steps == 0:
+        # t_max < dt: não há nenhum instante a simular
+        vazio = np.zeros(0, dtype=np.float32)
+        return t, vazio, vazio.copy(), vazio.copy()
+
+    # Instantes anteriores ao evento, calculados uma única vez para toda a simulação
+    antes_do_evento = t < R_event_time
+
+    # Tabela da resistência em todos os instantes de tempo, calculada de uma só vez
+    # Equivale a pegar_resistência(t[n]) para cada instante, sem nenhuma chamada de função por passo
+    R_arr = np.where(antes_do_evento, R_before, R_after)
+
+    # Inicialização das Variáveis 
+    # Prepara o vetor que armazenará a corrente em cada passo de tempo
+    # Começa com zeros e será preenchido trecho a trecho
+
+    # A única variável de estado do o sistema é a corrente no indutor (i_L)
+    # O estado descreve a "memória" ou a condição interna do sistema
+    # Os cálculos são feitos em precisão dupla (float64); só os vetores devolvidos são convertidos para float32
+    i_L = np.zeros(n_steps) # np.zeros cria uma matriz cheia de zeros a serem "completado"
+
+    # Condição inicial do sistema
+    # No tempo t=0, o circuito está desligado, então a corrente é zero
+    x = 0.0  # O estado 'x' é a corrente i_L. x(0) = 0
+
+    # A entrada do sistema (sinal de controle)
+    # Neste caso, é a tensão constante da fonte
+    u = V_fonte
+
+    # Solução por Trechos
+    # A resistência só muda nos eventos, então a simulação é dividida em trechos
+    # em que R é constante. Dentro de cada trecho a integração trapezoidal vira
+    #   x_próximo = r * x_agora + s
+    # com r e s constantes, cuja solução fechada (série geométrica) é
+    #   x[k0 + k] = r**k * x[k0] + s * (r**k - 1) / (r - 1)
+    # Assim não é preciso um loop passo a passo, apenas um cálculo por trecho.
+    mudanças = np.flatnonzero(np.diff(R_arr[:-1])) + 1 # Passos em que a resistência muda
+    inícios = np.concatenate(([0], mudanças))
+    fins = np.concatenate((mudanças, [n_steps - 1]))
+
+    for k0, k1 in zip(inícios, fins): # O loop percorre os trechos, não os passos
+
+        # Pega o valor da resistência do trecho (constante até o próximo evento)
+        R_n = float(R_arr[k0])
+
+        # Monta as "matrizes" (que aqui são números únicos) do modelo de estado
+        # Essas matrizes vêm da equação: di/dt = (-R/L)*i + (1/L)* V_fonte
+        A = -R_n / L   # Matriz A: Como o estado atual (corrente) influencia a sua própria mudança.
+        B = 1 / L      # Matriz B: Como a entrada (tensão da fonte) influencia a mudança do estado.
+
+        # Integração Trapezoidal: (1 - dt/2 * A) * x_próximo = (1 + dt/2 * A) * x_agora + dt * B * u
+        # Dividindo pelo lado esquerdo chegamos aos coeficientes da recorrência
+        lado_esquerdo = 1 - (dt / 2) * A
+        d = dt * A / lado_esquerdo # r - 1, calculado diretamente para evitar cancelamento quando R é pequeno
+        r = 1 + d                  # Quanto do estado atual passa para o próximo
+        s = dt * B * u / lado_esquerdo # Contribuição da fonte em cada passo
+
+        # Os passos n = k0 ... k1-1 geram os estados k0+1 ... k1
+        k = np.arange(k1 - k0 + 1)
+        if d == 0:
+            # Resistência nula (curto franco): r = 1 e a série geométrica vira uma rampa,
+            # limite de (r**k - 1) / (r - 1) = k
+            i_L[k0:k1 + 1] = x + s * k
+        else:
+            r_k_menos_1 = np.expm1(k * np.log1p(d)) # r**k - 1 sem cancelamento
+            i_L[k0:k1 + 1] = (r_k_menos_1 + 1) * x + s * r_k_menos_1 / d
+
+        # O último estado do trecho é a condição inicial do próximo trecho
+        x = i_L[k1]
+
+    # Cálculo das Saídas
+    # As tensões dependem apenas da corrente e da resistência em cada instante
+    v_R = R_arr * i_L # Lei de Ohm: v_R = R * i
+    v_L = V_fonte - v_R # Lei de Kirchhoff: v_L = V_fonte - v_R
+
+    # Precisão simples (float32) é suficiente para guardar e plotar os resultados
+    # e reduz pela metade a memória dos vetores devolvidos
+    return t, i_L.astype(np.float32), v_R.astype(np.float32), v_L.astype(np.float32)
 
 # Visualização dos Resultados
-# Cria os gráficos para analisar o que aconteceu na simulação
-# 'subplots' cria uma figura com vários gráficos
-fig, axes = plt.subplots(2, 1, figsize=(12, 9), sharex=True)
-fig.suptitle('Simulação de Curto-Circuito em Circuito RL Série', fontsize=16)
-
-# Gráfico da Corrente (eixo superior)
-axes[0].plot(t * 1000, i_L, label='Corrente no Indutor ($i_L$)', color='red')
-axes[0].set_ylabel('Corrente (A)')
-axes[0].grid(True)
-axes[0].legend()
-axes[0].set_title('Corrente do Circuito')
-# Adiciona uma linha vertical para marcar o momento exato do evento.
-
-# Gráfico das Tensões (eixo inferior)
-axes[1].plot(t * 1000, v_R, label='Tensão no Resistor ($v_R$)', color='blue')
-axes[1].plot(t * 1000, v_L, label='Tensão no Indutor ($v_L$)', color='green')
-axes[1].set_xlabel('Tempo (ms)') # O eixo x é compartilhado, então só precisa de um rótulo.
-axes[1].set_ylabel('Tensão (V)')
-axes[1].grid(True)
-axes[1].legend()
-axes[1].set_title('Tensões nos Componentes')
-
-
-# Ajusta o layout para evitar sobreposição de títulos e rótulos.
-plt.tight_layout(rect=[0, 0, 1, 0.96])
-
-# Mostra o gráfico na tela.
-plt.show()
\ No newline at end of file
+# O matplotlib só é importado dentro da função, apenas se os gráficos forem pedidos.
+# Assim, varreduras de parâmetros que rodam o script muitas vezes com --no-plot
+# não pagam o custo de importação do matplotlib a cada execução.
+def plot_results(t, i_L, v_R, v_L):
+    """Plota a corrente do circuito e as tensões nos componentes."""
+    import matplotlib.pyplot as plt
+
+    from graficos import decimate_minmax
+
+    # Cria os gráficos para analisar o que aconteceu na simulação
+    # 'subplots' cria uma figura com vários gráficos
+    fig, axes = plt.subplots(2, 1, figsize=(12, 9), sharex=True)
+    fig.suptitle('Simulação de Curto-Circuito em Circuito RL Série', fontsize=16)
+
+    t_ms = t * 1000 # Eixo de tempo em milissegundos
+
+    # Gráfico da Corrente (eixo superior)
+    axes[0].plot(*decimate_minmax(t_ms, i_L), label='Corrente no Indutor ($i_L$)', color='red')
+    axes[0].set_ylabel('Corrente (A)')
+    axes[0].grid(True)
+    axes[0].legend()
+    axes[0].set_title('Corrente do Circuito')
+    # Adiciona uma linha vertical para marcar o momento exato do evento.
+
+    # Gráfico das Tensões (eixo inferior)
+    axes[1].plot(*decimate_minmax(t_ms, v_R), label='Tensão no Resistor ($v_R$)', color='blue')
+    axes[1].plot(*decimate_minmax(t_ms, v_L), label='Tensão no Indutor ($v_L$)', color='green')
+    axes[1].set_xlabel('Tempo (ms)') # O eixo x é compartilhado, então só precisa de um rótulo.
+    axes[1].set_ylabel('Tensão (V)')
+    axes[1].grid(True)
+    axes[1].legend()
+    axes[1].set_title('Tensões nos Componentes')
+
+
+    # Ajusta o layout para evitar sobreposição de títulos e rótulos.
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+
+    # Mostra o gráfico na tela.
+    plt.show()
+
+if __name__ == '__main__':
+    # Argumentos de Linha de Comando
+    # --no-plot executa apenas a simulação, sem gerar os gráficos
+    parser = argparse.ArgumentParser(description='Simulação de curto-circuito em um circuito RL série.')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Não exibe os gráficos (útil em varreduras de parâmetros)')
+    args = parser.parse_args()
+
+    t, i_L, v_R, v_L = run(L, V_fonte, t_max, dt, R_event_time, R_before, R_after)
+
+    if not args.no_plot:
+        plot_results(t, i_L, v_R, v_L)
@@ -0,0 +1,28 @@
+import numpy as np
+
+# Decimação para os gráficos
+# Com muitos passos de simulação, desenhar todos os pontos deixa o matplotlib lento.
+# Os vetores são reduzidos apenas na hora de plotar: cada bloco de 'stride' pontos vira
+# apenas o seu mínimo e o seu máximo, de modo que os picos do transitório continuam visíveis.
+# Os vetores originais não são alterados e continuam disponíveis para os cálculos.
+def decimate_minmax(t, y, max_points=5000):
+    """Reduz (t, y) para cerca de max_points pontos, mantendo o mínimo e o máximo de cada bloco."""
+    n = y.size
+    stride = max(1, n // max(1, max_points // 2))  # Tamanho do bloco (cada bloco gera 2 pontos)
+    if stride <= 2:
+        return t, y  # Poucos pontos: nada a reduzir
+
+    n_blocks = n // stride
+    blocks = y[:n_blocks * stride].reshape(-1, stride)
+    offsets = np.arange(n_blocks) * stride
+    idx = [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)]
+
+    # As amostras que sobram depois do último bloco completo formam mais um bloco
+    start = n_blocks * stride
+    if start < n:
+        tail = y[start:]
+        idx.append([start + tail.argmin(), start + tail.argmax()])
+
+    # Índices no vetor original em ordem de tempo, incluindo o primeiro e o último ponto
+    idx = np.unique(np.concatenate(idx + [[0, n - 1]]))
+    return t[idx], y[idx]
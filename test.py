@@ -1,5 +1,6 @@
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Parâmetros do sistema (circuito π simplificado)
 R = 0.1  # Resistência da linha (ohms) - Não utilizado no modelo de estado simplificado, mas mantido para referência
@@ -11,84 +12,155 @@ V_source = 100  # Tensão da fonte (volts, constante para simplificação)
 # Parâmetros da simulação
 t_max = 0.01  # Tempo total de simulação (segundos)
 dt = 1e-6  # Passo de tempo (segundos)
-n_steps = int(t_max / dt)  # Número de passos
-t = np.linspace(0, t_max, n_steps)  # Vetor de tempo
-
-# Inicialização das variáveis de estado
-i_L = np.zeros(n_steps)  # Corrente no indutor
-v_C = np.zeros(n_steps)  # Tensão no capacitor
-i_load = np.zeros(n_steps)  # Corrente na carga
-
-# Função para calcular a resistência da carga (muda no tempo para simular evento dinâmico)
-def load_resistance(time_step):
-    """Retorna a resistência da carga baseada no tempo."""
-    if time_step < 0.005:  # Antes de 5ms, carga normal
-        return R_load_initial
-    else:  # Após 5ms, carga reduzida (simula aumento do consumo)
-        return R_load_initial / 2
-
-# Estado inicial
-x = np.array([0.0, 0.0])  # Estado inicial [i_L, v_C]
-
-# Vetor de entrada (constante)
-u_vec = np.array([V_source / L, 0])
-
-# Simulação passo a passo
-for n in range(n_steps - 1):
-    # Resistência da carga no instante atual
-    R_load_n = load_resistance(t[n])
-    
-    # Matriz de estado A ajustada com a carga atual
+t_event = 0.005  # Instante da mudança de carga (5ms)
+
+# Trajetória de x_next = M @ x_now + b sem loop passo a passo
+def affine_trajectory(M_aug, x0, out):
+    """Preenche out[k] com [x_k; 1] para a recorrência x_{k+1} = M @ x_k + b, com M_aug = [[M, b], [0, 1]]."""
+    # Sistema aumentado: [x_{k+1}; 1] = M_aug @ [x_k; 1], logo [x_k; 1] = M_aug^k @ [x_0; 1]
+    n = out.shape[0] - 1
+    out[0, :2] = x0
+    out[0, 2] = 1.0
+
+    # Dobra o número de estados conhecidos a cada iteração: x_{j+m} = M_aug^m @ x_j
+    m = 1
+    P = M_aug  # M_aug^m
+    while m <= n:
+        k = min(m, n + 1 - m)
+        np.matmul(out[:k], P.T, out=out[m:m + k])
+        P = P @ P
+        m *= 2
+
+# Simulação
+# Parametrizada em uma função para permitir varreduras de parâmetros e reuso em outros estudos
+def run(L, C, V_source, R_load_initial, t_max, dt, t_event):
+    """Simula o transitório com a carga caindo para R_load_initial / 2 em t_event.
+
+    Retorna t, i_L, v_C e i_load.
+    """
+    n_steps = int(t_max / dt)  # Número de passos
+    t = np.arange(n_steps) * dt  # Vetor de tempo (espaçado exatamente de dt)
+    if n_steps == 0:
+        # t_max < dt: não há nenhum instante a simular
+        empty = np.zeros(0, dtype=np.float32)
+        return t, empty, empty.copy(), empty.copy()
+    before_event = t < t_event  # Instantes antes da mudança de carga
+
+    # Resistência da carga em cada instante (muda no tempo para simular evento dinâmico)
+    # Antes de t_event, carga normal; depois, carga reduzida (simula aumento do consumo)
+    # Tabela equivalente à antiga função load_resistance(t), sem chamada de função por passo
+    R_load = np.where(before_event, R_load_initial, R_load_initial / 2)
+
+    # Matriz de estado A ajustada com a carga: [[0, -1/L], [1/C, -1/(R_load*C)]]
     # A equação para dv_C/dt é (i_L - i_load) / C = (i_L - v_C/R_load) / C = i_L/C - v_C/(R_load*C)
-    A_load = np.array([[0, -1/L],
-                       [1/C, -1/(R_load_n * C)]])
-    
+    # Só o termo A[1, 1] depende da carga, então o buffer é montado uma vez e atualizado no lugar
+    A_buf = np.zeros((2, 2))
+    A_buf[0, 1] = -1 / L
+    A_buf[1, 0] = 1 / C
+
     # Matriz Identidade
     I = np.eye(2)
-    
-    # Equação da integração trapezoidal: (I - dt/2 * A) * x_next = (I + dt/2 * A) * x_now + dt * u
+
+    # Vetor de entrada (constante)
     # O vetor de entrada u só afeta a primeira equação (di_L/dt)
-    
-    # Lado esquerdo da equação
-    left_side = I - (dt / 2) * A_load
-    
-    # Lado direito da equação
-    right_side_matrix = I + (dt / 2) * A_load
-    right_side_vector = right_side_matrix @ x + dt * u_vec
-    
-    # Resolve o sistema linear para encontrar o próximo estado
-    x_next = np.linalg.solve(left_side, right_side_vector)
-    
-    # Atualiza estados para o próximo passo
-    x = x_next
-    i_L[n + 1] = x[0]
-    v_C[n + 1] = x[1]
-    i_load[n + 1] = v_C[n + 1] / load_resistance(t[n+1])
-
-# Plot dos resultados
-plt.figure(figsize=(12, 8))
-
-# Gráfico da Tensão no Capacitor
-ax1 = plt.subplot(2, 1, 1)
-ax1.plot(t * 1000, v_C, label="Tensão no Capacitor ($v_C$)", color='blue')
-ax1.set_title('Simulação de Transitório Elétrico com Mudança de Carga', fontsize=16)
-ax1.set_ylabel("Tensão (V)")
-ax1.grid(True)
-ax1.axvline(x=5, color='r', linestyle='--', label='Mundança de Carga (5 ms)')
-ax1.legend()
-
-# Gráfico das Correntes
-ax2 = plt.subplot(2, 1, 2)
-ax2.plot(t * 1000, i_L, label="Corrente no Indutor ($i_L$)", color="orange")
-ax2.plot(t * 1000, i_load, label="Corrente na Carga ($i_{load}$)", color="green", linestyle='-.')
-ax2.set_xlabel("Tempo (ms)")
-ax2.set_ylabel("Corrente (A)")
-ax2.grid(True)
-ax2.axvline(x=5, color='r', linestyle='--', label='Mundança de Carga (5 ms)')
-ax2.legend()
-
-plt.tight_layout()
-plt.show()
+    u_vec = np.array([V_source / L, 0])
+    dt_u = dt * u_vec
+
+    # Buffers dos dois lados da equação trapezoidal e do sistema aumentado [[M, b], [0, 1]]
+    left_buf = np.empty((2, 2))
+    right_buf = np.empty((2, 2))
+    M_aug = np.eye(3)
+
+    # Estados aumentados [i_L, v_C, 1] de toda a simulação, preenchidos no lugar trecho a trecho
+    X = np.zeros((n_steps, 3))
+
+    # Estado inicial
+    x = np.zeros(2)  # Estado inicial [i_L, v_C]
+
+    # Simulação por trechos de carga constante
+    # Os passos n = k0 ... k1-1 usam a mesma carga e geram os estados k0+1 ... k1
+    changes = np.flatnonzero(np.diff(R_load[:-1])) + 1  # Passos em que a carga muda
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [n_steps - 1]))
+
+    for k0, k1 in zip(starts, ends):
+        # Atualiza a matriz de estado apenas quando a carga muda
+        A_buf[1, 1] = -1 / (float(R_load[k0]) * C)
+
+        # Equação da integração trapezoidal: (I - dt/2 * A) * x_next = (I + dt/2 * A) * x_now + dt * u
+        np.multiply(-dt / 2, A_buf, out=left_buf)
+        left_buf += I
+        np.multiply(dt / 2, A_buf, out=right_buf)
+        right_buf += I
+
+        # Um único solve por trecho com as duas colunas de right e a de dt*u lado a lado
+        # dá a forma x_next = M @ x_now + b
+        sol = np.linalg.solve(left_buf, np.column_stack((right_buf, dt_u)))
+        M_aug[:2, :2] = sol[:, :2]
+        M_aug[:2, 2] = sol[:, 2]
+
+        affine_trajectory(M_aug, x, X[k0:k1 + 1])
+
+        # O último estado do trecho é o estado inicial do próximo
+        x = X[k1, :2]
+
+    # Variáveis de estado (vistas do buffer, sem cópia)
+    i_L = X[:, 0]  # Corrente no indutor
+    v_C = X[:, 1]  # Tensão no capacitor
+
+    # Corrente na carga, calculada de uma vez a partir de v_C e da carga em cada instante
+    i_load = v_C / R_load
+
+    # A propagação é feita em float64; só os vetores devolvidos vão para precisão simples (float32),
+    # suficiente para guardar e plotar os resultados com metade da memória
+    return t, i_L.astype(np.float32), v_C.astype(np.float32), i_load.astype(np.float32)
+
+# Visualização dos resultados
+# O matplotlib só é importado se o gráfico for pedido, evitando o custo de importação em varreduras
+def plot_results(t, i_L, v_C, i_load):
+    """Plota a tensão no capacitor e as correntes no indutor e na carga."""
+    import matplotlib.pyplot as plt
+
+    from graficos import decimate_minmax
+
+    # Plot dos resultados
+    plt.figure(figsize=(12, 8))
+    t_ms = t * 1000  # Eixo de tempo em milissegundos
+
+    # Gráfico da Tensão no Capacitor
+    ax1 = plt.subplot(2, 1, 1)
+    ax1.plot(*decimate_minmax(t_ms, v_C), label="Tensão no Capacitor ($v_C$)", color='blue')
+    ax1.set_title('Simulação de Transitório Elétrico com Mudança de Carga', fontsize=16)
+    ax1.set_ylabel("Tensão (V)")
+    ax1.grid(True)
+    ax1.axvline(x=5, color='r', linestyle='--', label='Mundança de Carga (5 ms)')
+    ax1.legend()
+
+    # Gráfico das Correntes
+    ax2 = plt.subplot(2, 1, 2)
+    ax2.plot(*decimate_minmax(t_ms, i_L), label="Corrente no Indutor ($i_L$)", color="orange")
+    ax2.plot(*decimate_minmax(t_ms, i_load), label="Corrente na Carga ($i_{load}$)", color="green", linestyle='-.')
+    ax2.set_xlabel("Tempo (ms)")
+    ax2.set_ylabel("Corrente (A)")
+    ax2.grid(True)
+    ax2.axvline(x=5, color='r', linestyle='--', label='Mundança de Carga (5 ms)')
+    ax2.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == '__main__':
+    # Argumentos de linha de comando
+    parser = argparse.ArgumentParser(description='Transitório em um circuito π simplificado com mudança de carga.')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Não exibe os gráficos (útil em varreduras de parâmetros)')
+    args = parser.parse_args()
+
+    t, i_L, v_C, i_load = run(L, C, V_source, R_load_initial, t_max, dt, t_event)
+
+    if not args.no_plot:
+        plot_results(t, i_L, v_C, i_load)
+
 
 
 '''Explicação Prévia